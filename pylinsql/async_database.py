@@ -73,15 +73,17 @@ class DatabasePool:
     """
 
     pool: asyncpg.pool.Pool
+    params: Optional[ConnectionParameters]
 
-    def __init__(self, pool):
+    def __init__(self, pool, params: Optional[ConnectionParameters] = None):
         self.pool = pool
+        self.params = params
 
     @asynccontextmanager
     async def connection(self) -> AsyncIterator[DatabaseConnection]:
         conn = await self.pool.acquire()
         try:
-            yield DatabaseConnection(conn)
+            yield DatabaseConnection(conn, self.params)
         finally:
             await self.pool.release(conn)
 
@@ -154,7 +156,7 @@ async def pool(
         params = ConnectionParameters()
     pool = await _create_pool(params)
     try:
-        yield DatabasePool(pool)
+        yield DatabasePool(pool, params)
     finally:
         await pool.close()
         pool.terminate()
@@ -162,9 +164,11 @@ async def pool(
 
 class DatabaseClient:
     conn: asyncpg.Connection
+    params: Optional[ConnectionParameters]
 
-    def __init__(self, conn):
+    def __init__(self, conn, params: Optional[ConnectionParameters] = None):
         self.conn = conn
+        self.params = params
 
     @staticmethod
     def _unwrap_one(target_type: Type[T], record: asyncpg.Record) -> Optional[T]:
@@ -360,21 +364,23 @@ class DatabaseClient:
 
 
 class DatabaseTransaction(DatabaseClient):
-    def __init__(self, conn, transaction):
-        super().__init__(conn)
+    def __init__(
+        self, conn, transaction, params: Optional[ConnectionParameters] = None
+    ):
+        super().__init__(conn, params)
         self.transaction = transaction
 
 
 class DatabaseConnection(DatabaseClient):
-    def __init__(self, conn):
-        super().__init__(conn)
+    def __init__(self, conn, params: Optional[ConnectionParameters] = None):
+        super().__init__(conn, params)
 
     @asynccontextmanager
     async def transaction(self) -> AsyncIterator[DatabaseTransaction]:
         transaction = self.conn.transaction()
         await transaction.start()
         try:
-            yield DatabaseTransaction(self.conn, transaction)
+            yield DatabaseTransaction(self.conn, transaction, self.params)
         except:
             await transaction.rollback()
             raise
@@ -390,7 +396,7 @@ async def connection(
         params = ConnectionParameters()
     conn = await _create_connection(params)
     try:
-        yield DatabaseConnection(conn)
+        yield DatabaseConnection(conn, params)
     finally:
         await conn.close()
 
@@ -419,8 +425,7 @@ class SharedDatabasePool(DatabasePool):
     params: ConnectionParameters
 
     def __init__(self, pool: DatabasePool, params: ConnectionParameters):
-        super().__init__(pool)
-        self.params = params
+        super().__init__(pool, params)
         _get_shared_pool()[params] = self
 
     def __del__(self):
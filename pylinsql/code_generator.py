@@ -1,44 +1,76 @@
 import asyncio
 import dataclasses
 import datetime
-import io
+import functools
 import keyword
 import sys
+import time
+from contextlib import asynccontextmanager
 from dataclasses import MISSING, Field, dataclass
-from typing import Any, Dict, List, Optional, TextIO, Tuple, TypeVar
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import asyncpg
 
 from . import async_database
-from .async_database import ConnectionParameters, DatabaseClient
+from .async_database import ConnectionParameters, DatabaseClient, DatabasePool
 from .base import DataClass, cast_if_not_none, is_optional_type, unwrap_optional_type
 from .schema import ForeignKey, PrimaryKey, Reference
 
 T = TypeVar("T")
 
+_PY_KEYWORDS = frozenset(keyword.kwlist)
 
+
+def _group_by(items: Iterable[T], key: Callable[[T], str]) -> Dict[str, List[T]]:
+    "Partitions a sequence of items into lists based on a key, preserving the original order."
+
+    groups: Dict[str, List[T]] = {}
+    for item in items:
+        groups.setdefault(key(item), []).append(item)
+    return groups
+
+
+_DB_TO_PY: Dict[str, type] = {
+    "character varying": str,
+    "text": str,
+    "boolean": bool,
+    "smallint": int,
+    "integer": int,
+    "bigint": int,
+    "real": float,
+    "double precision": float,
+    "date": datetime.date,
+    "time": datetime.time,
+    "time with time zone": datetime.time,
+    "time without time zone": datetime.time,
+    "timestamp": datetime.datetime,
+    "timestamp with time zone": datetime.datetime,
+    "timestamp without time zone": datetime.datetime,
+}
+
+
+@functools.lru_cache(maxsize=None)
 def _db_type_to_py_type(
     db_type: str, is_nullable: bool, has_default: bool
 ) -> Tuple[type, type]:
     "Maps a PostgreSQL type to a Python type."
 
-    if db_type in ["character varying", "text"]:
-        py_type = str
-    elif db_type in ["boolean"]:
-        py_type = bool
-    elif db_type in ["smallint", "integer", "bigint"]:
-        py_type = int
-    elif db_type in ["real", "double precision"]:
-        py_type = float
-    elif db_type in ["date"]:
-        py_type = datetime.date
-    elif db_type in ["time", "time with time zone", "time without time zone"]:
-        py_type = datetime.time
-    elif db_type in [
-        "timestamp",
-        "timestamp with time zone",
-        "timestamp without time zone",
-    ]:
-        py_type = datetime.datetime
-    else:
+    py_type = _DB_TO_PY.get(db_type)
+    if py_type is None:
         raise RuntimeError(f"unrecognized database type: {db_type}")
 
     if is_nullable and not has_default:
@@ -102,260 +134,298 @@ class _ReferenceConstraint:
     primary_key_column: str
 
 
+# tables in the schema in alphabetical order
+_TABLES_SQL = """
+    SELECT
+        table_name
+    FROM
+        information_schema.tables
+    WHERE
+        table_catalog = CURRENT_CATALOG AND table_schema = $1
+    ORDER BY
+        table_name
+"""
+
+# columns of all tables in the schema, including table and column descriptions
+_COLS_SQL = """
+    WITH
+        column_description AS (
+            SELECT
+                cls.relname,
+                dsc.objsubid,
+                dsc.description
+            FROM
+                pg_catalog.pg_class cls
+                    INNER JOIN pg_catalog.pg_namespace ns ON cls.relnamespace = ns.oid
+                    INNER JOIN pg_catalog.pg_description dsc ON cls.oid = dsc.objoid
+            WHERE
+                ns.nspname = $1
+        )
+    SELECT
+        table_name,
+        column_name,
+        CASE
+            WHEN is_nullable = 'YES' THEN TRUE
+            WHEN is_nullable = 'NO' THEN FALSE
+            ELSE NULL
+        END AS is_nullable,
+        data_type,
+        column_default,
+        character_maximum_length,
+        CASE
+            WHEN is_identity = 'YES' THEN TRUE
+            WHEN is_identity = 'NO' THEN FALSE
+            ELSE NULL
+        END AS is_identity,
+        col_dsc.description AS description,
+        tab_dsc.description AS table_description
+    FROM
+        information_schema.columns cols
+            LEFT JOIN column_description col_dsc ON
+                cols.table_name = col_dsc.relname AND
+                cols.ordinal_position = col_dsc.objsubid
+            LEFT JOIN column_description tab_dsc ON
+                cols.table_name = tab_dsc.relname AND
+                tab_dsc.objsubid = 0
+    WHERE
+        table_catalog = CURRENT_CATALOG AND table_schema = $1
+    ORDER BY
+        table_name, ordinal_position
+"""
+
+# primary key and foreign key columns of all tables in the schema (with referenced primary key columns)
+_CONSTRAINTS_SQL = """
+    SELECT
+        'PRIMARY KEY' AS constraint_type,
+        ukey.constraint_name AS key_name,
+        ukey.table_schema AS key_schema,
+        ukey.table_name AS key_table,
+        ukey.column_name AS key_column,
+        ukey.ordinal_position AS key_position,
+        NULL AS primary_key_schema,
+        NULL AS primary_key_table,
+        NULL AS primary_key_column
+    FROM
+        information_schema.table_constraints tab_con
+            INNER JOIN information_schema.key_column_usage ukey ON
+                tab_con.constraint_catalog = ukey.constraint_catalog AND
+                tab_con.constraint_schema = ukey.constraint_schema AND
+                tab_con.constraint_name = ukey.constraint_name
+    WHERE
+        ukey.table_catalog = CURRENT_CATALOG
+            AND ukey.table_schema = $1
+            AND tab_con.constraint_type = 'PRIMARY KEY'
+
+    UNION ALL
+
+    SELECT
+        'FOREIGN KEY' AS constraint_type,
+        fkey.constraint_name AS key_name,
+        fkey.table_schema AS key_schema,
+        fkey.table_name AS key_table,
+        fkey.column_name AS key_column,
+        fkey.ordinal_position AS key_position,
+        pkey.table_schema AS primary_key_schema,
+        pkey.table_name AS primary_key_table,
+        pkey.column_name AS primary_key_column
+    FROM
+        information_schema.referential_constraints ref_con
+            INNER JOIN information_schema.key_column_usage pkey ON
+                ref_con.unique_constraint_catalog = pkey.constraint_catalog AND
+                ref_con.unique_constraint_schema = pkey.constraint_schema AND
+                ref_con.unique_constraint_name = pkey.constraint_name
+            INNER JOIN information_schema.key_column_usage fkey ON
+                ref_con.constraint_catalog = fkey.constraint_catalog AND
+                ref_con.constraint_schema = fkey.constraint_schema AND
+                ref_con.constraint_name = fkey.constraint_name
+    WHERE
+        fkey.table_catalog = CURRENT_CATALOG
+            AND fkey.table_schema = $1
+
+    ORDER BY
+        key_table, key_position
+"""
+
+
 class _CatalogSchemaBuilder:
-    conn: DatabaseClient
+    conn: Union[DatabaseClient, DatabasePool]
     db_schema: str
 
-    def __init__(self, conn: DatabaseClient, db_schema: str):
+    def __init__(self, conn: Union[DatabaseClient, DatabasePool], db_schema: str):
         self.conn = conn
         self.db_schema = db_schema
 
+    @asynccontextmanager
+    async def _client(self) -> AsyncIterator[DatabaseClient]:
+        "Provides a database client to issue a query with."
+
+        if isinstance(self.conn, DatabasePool):
+            # each query acquires a connection of its own such that queries can run concurrently
+            async with self.conn.connection() as conn:
+                yield conn
+        else:
+            yield self.conn
+
+    async def _fetch_all(self, *fetchers: Callable[[], Awaitable[Any]]) -> List[Any]:
+        "Runs independent metadata queries, concurrently if the builder draws from a pool."
+
+        if not isinstance(self.conn, DatabasePool):
+            # asyncpg does not allow concurrent operations on the same connection
+            return [await fetch() for fetch in fetchers]
+
+        tasks = [asyncio.ensure_future(fetch()) for fetch in fetchers]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            # make sure no query outlives the call (e.g. running on a pool that is about to be closed)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
     async def get_catalog_schema(self) -> CatalogSchema:
         "Retrieves metadata for the current catalog."
 
-        # query table names in dependency order
-        query = """
-            WITH RECURSIVE dependencies(
-                    depth,
-                    parent_catalog,
-                    parent_schema,
-                    parent_name,
-                    child_catalog,
-                    child_schema,
-                    child_name
-            ) AS (
-                -- tables that have no foreign keys
-                SELECT
-                    1 AS depth,
-                    pkey.table_catalog,
-                    pkey.table_schema,
-                    pkey.table_name,
-                    tab.table_catalog,
-                    tab.table_schema,
-                    tab.table_name
-                FROM
-                    information_schema.referential_constraints AS ref_con
-                        INNER JOIN information_schema.key_column_usage AS pkey ON
-                            ref_con.unique_constraint_catalog = pkey.constraint_catalog AND
-                            ref_con.unique_constraint_schema = pkey.constraint_schema AND
-                            ref_con.unique_constraint_name = pkey.constraint_name
-                        INNER JOIN information_schema.key_column_usage AS fkey ON
-                            ref_con.constraint_catalog = fkey.constraint_catalog AND
-                            ref_con.constraint_schema = fkey.constraint_schema AND
-                            ref_con.constraint_name = fkey.constraint_name
-                        RIGHT JOIN information_schema.tables AS tab ON
-                            tab.table_catalog = fkey.table_catalog AND
-                            tab.table_schema = fkey.table_schema AND
-                            tab.table_name = fkey.table_name
-                WHERE
-                    tab.table_catalog = CURRENT_CATALOG AND
-                    tab.table_schema = $1 AND
-                    pkey.table_catalog IS NULL AND
-                    pkey.table_schema IS NULL AND
-                    pkey.table_name IS NULL
-            UNION ALL
-                -- tables that only depend on tables returned by the previous recursion steps
-                SELECT
-                    dep.depth + 1,
-                    dep.child_catalog,
-                    dep.child_schema,
-                    dep.child_name,
-                    tab.table_catalog,
-                    tab.table_schema,
-                    tab.table_name
-                FROM
-                    information_schema.referential_constraints AS ref_con
-                        INNER JOIN information_schema.key_column_usage AS pkey ON
-                            ref_con.unique_constraint_catalog = pkey.constraint_catalog AND
-                            ref_con.unique_constraint_schema = pkey.constraint_schema AND
-                            ref_con.unique_constraint_name = pkey.constraint_name
-                        INNER JOIN information_schema.key_column_usage AS fkey ON
-                            ref_con.constraint_catalog = fkey.constraint_catalog AND
-                            ref_con.constraint_schema = fkey.constraint_schema AND
-                            ref_con.constraint_name = fkey.constraint_name
-                        INNER JOIN information_schema.tables AS tab ON
-                            tab.table_catalog = fkey.table_catalog AND
-                            tab.table_schema = fkey.table_schema AND
-                            tab.table_name = fkey.table_name
-                        INNER JOIN dependencies AS dep ON
-                            dep.child_catalog = pkey.table_catalog AND
-                            dep.child_schema = pkey.table_schema AND
-                            dep.child_name = pkey.table_name
-                WHERE
-                    tab.table_catalog = CURRENT_CATALOG AND
-                    tab.table_schema = $1
+        tables, columns, (primary_keys, foreign_keys) = await self._fetch_all(
+            self._fetch_all_tables,
+            self._fetch_all_columns,
+            self._fetch_all_constraints,
+        )
+
+        # assemble table metadata from schema-wide resultsets
+        columns_by_table = _group_by(columns, lambda column: column["table_name"])
+        primary_keys_by_table = _group_by(primary_keys, lambda key: key.key_table)
+        foreign_keys_by_table = _group_by(
+            foreign_keys, lambda key: key.foreign_key_table
+        )
+
+        table_schemas = []
+        for table in tables:
+            table_columns = columns_by_table.get(table, [])
+            table_schema = TableSchema(
+                name=table,
+                description=(
+                    table_columns[0]["table_description"] if table_columns else None
+                ),
+                columns=self._get_column_schemas(table_columns),
             )
-            SELECT
-                child_name
-            FROM
-                dependencies
-            GROUP BY
-                child_name
-            ORDER BY
-                -- minimum depth reflects the first encounter of a table (tables may depend on several tables)
-                MIN(depth), child_name
-        """
-        tables = await self.conn.typed_fetch_column(str, query, self.db_schema)
-        table_schemas = [await self._get_table_schema(table) for table in tables]
-        table_schema_map = dict((table.name, table) for table in table_schemas)
+            self._bind_foreign_keys(table_schema, foreign_keys_by_table.get(table, []))
+            self._bind_primary_key(table_schema, primary_keys_by_table.get(table, []))
+            table_schemas.append(table_schema)
+        table_schema_map = {table.name: table for table in table_schemas}
         return CatalogSchema(name=self.db_schema, tables=table_schema_map)
 
-    async def _get_table_schema(self, db_table: str) -> TableSchema:
-        "Retrieves metadata for a table in the current catalog."
+    async def _fetch_all_tables(self) -> List[str]:
+        "Retrieves table names in the current schema in alphabetical order."
 
-        query = """
-            SELECT
-                dsc.description
-            FROM
-                pg_catalog.pg_class cls
-                    INNER JOIN pg_catalog.pg_namespace ns ON cls.relnamespace = ns.oid
-                    INNER JOIN pg_catalog.pg_description dsc ON cls.oid = dsc.objoid
-            WHERE
-                ns.nspname = $1 AND cls.relname = $2 AND dsc.objsubid = 0
-        """
-        description = await self.conn.typed_fetch_value(
-            str, query, self.db_schema, db_table
-        )
+        async with self._client() as conn:
+            return await conn.typed_fetch_column(str, _TABLES_SQL, self.db_schema)
+
+    async def _fetch_all_columns(self) -> List[asyncpg.Record]:
+        "Retrieves the columns of each table in the current schema, including table and column descriptions."
+
+        async with self._client() as conn:
+            return await conn.raw_fetch(_COLS_SQL, self.db_schema)
 
-        query = """
-            WITH
-                column_description AS (
-                    SELECT
-                        dsc.objsubid,
-                        dsc.description
-                    FROM
-                        pg_catalog.pg_class cls
-                            INNER JOIN pg_catalog.pg_namespace ns ON cls.relnamespace = ns.oid
-                            INNER JOIN pg_catalog.pg_description dsc ON cls.oid = dsc.objoid
-                    WHERE
-                        ns.nspname = $1 AND cls.relname = $2
+    async def _fetch_all_constraints(
+        self,
+    ) -> Tuple[List[_UniqueConstraint], List[_ReferenceConstraint]]:
+        "Retrieves the primary key and foreign key columns of each table in the current schema."
+
+        async with self._client() as conn:
+            constraints = await conn.raw_fetch(_CONSTRAINTS_SQL, self.db_schema)
+
+        primary_keys = []
+        foreign_keys = []
+        for constraint in constraints:
+            if constraint["constraint_type"] == "PRIMARY KEY":
+                primary_keys.append(
+                    _UniqueConstraint(
+                        key_name=constraint["key_name"],
+                        key_schema=constraint["key_schema"],
+                        key_table=constraint["key_table"],
+                        key_column=constraint["key_column"],
+                    )
                 )
-            SELECT
-                column_name,
-                CASE
-                    WHEN is_nullable = 'YES' THEN TRUE
-                    WHEN is_nullable = 'NO' THEN FALSE
-                    ELSE NULL
-                END AS is_nullable,
-                data_type,
-                column_default,
-                character_maximum_length,
-                CASE
-                    WHEN is_identity = 'YES' THEN TRUE
-                    WHEN is_identity = 'NO' THEN FALSE
-                    ELSE NULL
-                END AS is_identity,
-                description
-            FROM
-                information_schema.columns cols
-                    LEFT JOIN column_description ON cols.ordinal_position = objsubid
-            WHERE
-                table_catalog = CURRENT_CATALOG AND table_schema = $1 AND table_name = $2
-            ORDER BY
-                ordinal_position
-        """
-        columns = await self.conn.raw_fetch(query, self.db_schema, db_table)
-        column_schemas = {}
-        for column in columns:
-            outer_type, value_type = _db_type_to_py_type(
-                column["data_type"],
-                column["is_nullable"],
-                column["column_default"] is not None,
-            )
+            else:
+                foreign_keys.append(
+                    _ReferenceConstraint(
+                        foreign_key_name=constraint["key_name"],
+                        foreign_key_schema=constraint["key_schema"],
+                        foreign_key_table=constraint["key_table"],
+                        foreign_key_column=constraint["key_column"],
+                        primary_key_schema=constraint["primary_key_schema"],
+                        primary_key_table=constraint["primary_key_table"],
+                        primary_key_column=constraint["primary_key_column"],
+                    )
+                )
+        return primary_keys, foreign_keys
 
-            column_schema = ColumnSchema(
-                name=column["column_name"],
-                data_type=outer_type,
-                default=cast_if_not_none(value_type, column["column_default"]),
-                description=column["description"],
-            )
-            column_schemas[column_schema.name] = column_schema
+    @staticmethod
+    def _get_column_schemas(columns: List[asyncpg.Record]) -> Dict[str, ColumnSchema]:
+        "Maps column metadata of a table to column schema objects."
 
-        table_schema = TableSchema(
-            name=db_table, description=description, columns=column_schemas
-        )
-        await self._set_foreign_keys(table_schema)
-        await self._set_unique_keys(table_schema)
-        return table_schema
+        return {
+            column["column_name"]: _CatalogSchemaBuilder._get_column_schema(column)
+            for column in columns
+        }
 
-    async def _set_unique_keys(self, table_schema: TableSchema) -> None:
-        query = """
-            SELECT
-                ukey.constraint_name AS key_name,
-                ukey.table_schema AS key_schema,
-                ukey.table_name AS key_table,
-                ukey.column_name AS key_column
+    @staticmethod
+    def _get_column_schema(column: asyncpg.Record) -> ColumnSchema:
+        "Maps column metadata to a column schema object."
 
-            FROM
-                information_schema.table_constraints tab_con
-                    INNER JOIN information_schema.key_column_usage ukey ON
-                        tab_con.constraint_catalog = ukey.constraint_catalog AND
-                        tab_con.constraint_schema = ukey.constraint_schema AND
-                        tab_con.constraint_name = ukey.constraint_name
-                        
-            WHERE ukey.table_catalog = CURRENT_CATALOG
-                AND ukey.table_schema = $1
-                AND ukey.table_name = $2
-                AND tab_con.constraint_type = 'PRIMARY KEY'
-        """
-        constraints = await self.conn.typed_fetch(
-            _UniqueConstraint, query, self.db_schema, table_schema.name
+        outer_type, value_type = _db_type_to_py_type(
+            column["data_type"],
+            column["is_nullable"],
+            column["column_default"] is not None,
         )
-        if len(constraints) > 1:
-            table_schema.primary_key = PrimaryKey(
+
+        return ColumnSchema(
+            name=column["column_name"],
+            data_type=outer_type,
+            default=cast_if_not_none(value_type, column["column_default"]),
+            description=column["description"],
+        )
+
+    @staticmethod
+    def _bind_primary_key(
+        table_schema: TableSchema, constraints: List[_UniqueConstraint]
+    ) -> None:
+        "Sets the primary key of a table."
+
+        table_schema.primary_key = (
+            PrimaryKey(
                 constraints[0].key_name,
                 [constraint.key_column for constraint in constraints],
             )
-        elif len(constraints) > 0:
-            table_schema.primary_key = PrimaryKey(
-                constraints[0].key_name, constraints[0].key_column
-            )
-        else:
-            table_schema.primary_key = None
+            if constraints
+            else None
+        )
 
-    async def _set_foreign_keys(self, table_schema: TableSchema) -> None:
+    @staticmethod
+    def _bind_foreign_keys(
+        table_schema: TableSchema, constraints: List[_ReferenceConstraint]
+    ) -> None:
         "Binds table relations associating foreign keys with primary keys."
 
-        query = """
-            SELECT
-                fkey.constraint_name AS foreign_key_name,
-                fkey.table_schema AS foreign_key_schema,
-                fkey.table_name AS foreign_key_table,
-                fkey.column_name AS foreign_key_column,
-                pkey.constraint_name AS primary_key_name,
-                pkey.table_schema AS primary_key_schema,
-                pkey.table_name AS primary_key_table,
-                pkey.column_name AS primary_key_column
-            FROM
-                information_schema.referential_constraints ref_con
-                    INNER JOIN information_schema.key_column_usage pkey ON
-                        ref_con.unique_constraint_catalog = pkey.constraint_catalog AND
-                        ref_con.unique_constraint_schema = pkey.constraint_schema AND
-                        ref_con.unique_constraint_name = pkey.constraint_name
-                    INNER JOIN information_schema.key_column_usage fkey ON
-                        ref_con.constraint_catalog = fkey.constraint_catalog AND
-                        ref_con.constraint_schema = fkey.constraint_schema AND
-                        ref_con.constraint_name = fkey.constraint_name
-            WHERE
-                fkey.table_catalog = CURRENT_CATALOG
-                    AND fkey.table_schema = $1
-                    AND fkey.table_name = $2
-        """
-        constraints = await self.conn.typed_fetch(
-            _ReferenceConstraint, query, self.db_schema, table_schema.name
-        )
+        # validate constraints up front such that binding needs no checks
         for constraint in constraints:
             if constraint.foreign_key_schema != constraint.primary_key_schema:
                 raise RuntimeError(
                     f"foreign key table schema {constraint.foreign_key_schema} and primary key table schema {constraint.primary_key_schema} are not the same"
                 )
 
-            column = table_schema.columns[constraint.foreign_key_column]
-            if column.references is not None:
-                raise RuntimeError(
-                    f"column {column.name} already has a foreign key constraint"
-                )
+        column_names = [constraint.foreign_key_column for constraint in constraints]
+        if len(column_names) != len(set(column_names)):
+            duplicate = next(
+                name for name in column_names if column_names.count(name) > 1
+            )
+            raise RuntimeError(
+                f"column {duplicate} already has a foreign key constraint"
+            )
 
+        for constraint in constraints:
+            column = table_schema.columns[constraint.foreign_key_column]
             column.references = ForeignKey(
                 name=constraint.foreign_key_name,
                 references=Reference(
@@ -365,15 +435,69 @@ class _CatalogSchemaBuilder:
             )
 
 
-async def get_catalog_schema(conn: DatabaseClient, db_schema: str) -> CatalogSchema:
+@dataclass
+class _CatalogCacheEntry:
+    fetched_at: float
+    ttl: float
+    catalog: CatalogSchema
+
+
+_catalog_cache: Dict[Tuple[ConnectionParameters, str], _CatalogCacheEntry] = {}
+
+
+async def get_catalog_schema(
+    conn: Union[DatabaseClient, DatabasePool],
+    db_schema: str,
+    *,
+    cache_ttl: Optional[float] = None,
+) -> CatalogSchema:
+    """
+    Retrieves metadata for all tables in a database schema.
+
+    When passed a connection pool, metadata queries are issued concurrently, each on a connection of its own.
+
+    When a cache time-to-live (in seconds) is given, metadata fetched by an earlier call with the same connection
+    parameters and schema is reused unless it is older than the time-to-live. Cached metadata is discarded once it
+    outlives the time-to-live it was stored with. Cached metadata is shared, and must not be mutated. Clients created
+    without connection parameters bypass the cache.
+    """
+
+    if cache_ttl is None or conn.params is None:
+        builder = _CatalogSchemaBuilder(conn, db_schema)
+        return await builder.get_catalog_schema()
+
+    key = (conn.params, db_schema)
+    entry = _catalog_cache.get(key)
+    if entry is not None and time.monotonic() - entry.fetched_at < cache_ttl:
+        return entry.catalog
+
     builder = _CatalogSchemaBuilder(conn, db_schema)
-    return await builder.get_catalog_schema()
+    catalog = await builder.get_catalog_schema()
+
+    # drop entries that have outlived the time-to-live they were stored with
+    now = time.monotonic()
+    expired_keys = [
+        cached_key
+        for cached_key, cached_entry in _catalog_cache.items()
+        if now - cached_entry.fetched_at >= cached_entry.ttl
+    ]
+    for expired_key in expired_keys:
+        del _catalog_cache[expired_key]
+
+    _catalog_cache[key] = _CatalogCacheEntry(now, cache_ttl, catalog)
+    return catalog
+
+
+def clear_catalog_cache() -> None:
+    "Discards all catalog metadata cached by get_catalog_schema."
+
+    _catalog_cache.clear()
 
 
 def column_to_field(
     column: ColumnSchema,
 ) -> Tuple[str, type, Field]:
-    if keyword.iskeyword(column.name):
+    if column.name in _PY_KEYWORDS:
         field_name = f"{column.name}_"  # PEP 8: single trailing underscore to avoid conflicts with Python keyword
     else:
         field_name = column.name
@@ -401,13 +525,15 @@ def table_to_dataclass(table: TableSchema) -> DataClass:
     "Generates a dataclass type corresponding to a table schema."
 
     fields = [column_to_field(column) for column in table.columns.values()]
-    if keyword.iskeyword(table.name):
+    if table.name in _PY_KEYWORDS:
         class_name = f"{table.name}_"  # PEP 8: single trailing underscore to avoid conflicts with Python keyword
     else:
         class_name = table.name
 
-    # default arguments must follow non-default arguments
-    fields.sort(key=lambda f: f[2].default is not MISSING)
+    # default arguments must follow non-default arguments (stable partition preserves column order)
+    fields = [f for f in fields if f[2].default is MISSING] + [
+        f for f in fields if f[2].default is not MISSING
+    ]
 
     typ = dataclasses.make_dataclass(class_name, fields)
     typ.__doc__ = table.description
@@ -422,36 +548,59 @@ def catalog_to_dataclasses(catalog: CatalogSchema) -> List[DataClass]:
     return [table_to_dataclass(table) for table in catalog.tables.values()]
 
 
-def dataclasses_to_stream(types: List[DataClass], target: TextIO):
-    "Generates Python code corresponding to a dataclass type."
+_HEADER = """\
+# This source file has been generated by a tool, do not edit
+from __future__ import annotations
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from typing import Optional
+from pylinsql.schema import *"""
+
+
+# names of scalar types as imported in the header of generated code
+_TYPE_NAMES: Dict[type, str] = {
+    int: "int",
+    str: "str",
+    float: "float",
+    bool: "bool",
+    datetime.date: "date",
+    datetime.datetime: "datetime",
+    datetime.time: "time",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _render_type(typ: type) -> str:
+    "Generates the Python type annotation corresponding to a (possibly optional) type."
+
+    if is_optional_type(typ):
+        inner_type = unwrap_optional_type(typ)
+        return f"Optional[{_TYPE_NAMES.get(inner_type) or inner_type.__name__}]"
+    else:
+        return _TYPE_NAMES.get(typ) or typ.__name__
 
-    print("# This source file has been generated by a tool, do not edit", file=target)
-    print("from dataclasses import dataclass, field", file=target)
-    print("from datetime import date, datetime, time", file=target)
-    print("from typing import Optional", file=target)
-    print("from pylinsql.schema import *", file=target)
-    print(file=target)
 
+def _dataclasses_to_lines(types: List[DataClass]) -> Iterator[str]:
+    "Generates lines of Python code (each terminated by a newline) corresponding to a list of dataclass types."
+
+    yield f"{_HEADER}\n"
+    yield "\n"
     for typ in types:
-        print(file=target)
-        print("@dataclass", file=target)
-        print(f"class {typ.__name__}:", file=target)
+        yield "\n"
+        yield "@dataclass\n"
+        yield f"class {typ.__name__}:\n"
         if typ.__doc__:
-            print(f"    {repr(typ.__doc__)}", file=target)
-            print(file=target)
+            yield f"    {repr(typ.__doc__)}\n"
+            yield "\n"
 
         # primary key
         if getattr(typ, "primary_key", None) is not None:
-            print(f"    primary_key = {repr(typ.primary_key)}", file=target)
-            print(file=target)
+            yield f"    primary_key = {repr(typ.primary_key)}\n"
+            yield "\n"
 
         # table columns
         for field in dataclasses.fields(typ):
-            if is_optional_type(field.type):
-                inner_type = unwrap_optional_type(field.type)
-                type_name = f"Optional[{inner_type.__name__}]"
-            else:
-                type_name = field.type.__name__
+            type_name = _render_type(field.type)
             if field.default is not MISSING and field.metadata:
                 initializer = f" = field(default = {repr(field.default)}, metadata = {repr(dict(field.metadata))})"
             elif field.metadata:
@@ -460,27 +609,30 @@ def dataclasses_to_stream(types: List[DataClass], target: TextIO):
                 initializer = f" = {repr(field.default)}"
             else:
                 initializer = ""
-            print(f"    {field.name}: {type_name}{initializer}", file=target)
-        print(file=target)
+            yield f"    {field.name}: {type_name}{initializer}\n"
+        yield "\n"
+
+
+def dataclasses_to_stream(types: List[DataClass], target: TextIO):
+    "Generates Python code corresponding to a dataclass type."
+
+    target.writelines(_dataclasses_to_lines(types))
 
 
 def dataclasses_to_code(types: List[DataClass]) -> str:
-    f = io.StringIO()
-    dataclasses_to_stream(types, f)
-    return f.getvalue()
+    return "".join(_dataclasses_to_lines(types))
 
 
 async def main(output_path: str, db_schema: str) -> None:
-    async with async_database.connection(ConnectionParameters()) as conn:
-        catalog = await get_catalog_schema(conn, db_schema)
+    async with async_database.pool(ConnectionParameters()) as pool:
+        catalog = await get_catalog_schema(pool, db_schema)
 
     if not catalog:
         raise RuntimeError(f'catalog schema "{db_schema}" is empty')
 
     types = catalog_to_dataclasses(catalog)
-    code = dataclasses_to_code(types)
     with open(output_path, "w") as f:
-        f.write(code)
+        dataclasses_to_stream(types, f)
 
 
 if __name__ == "__main__":
@@ -498,8 +650,17 @@ if __name__ == "__main__":
     )
     parser.add_argument("--schema", default="public", help="database schema to export")
     args = parser.parse_args()
+
+    # use a faster event loop implementation if available (not supported on Windows, uvloop.run requires 0.18+)
+    try:
+        import uvloop
+
+        run = getattr(uvloop, "run", asyncio.run)
+    except ImportError:
+        run = asyncio.run
+
     try:
-        asyncio.run(main(args.output, args.schema))
+        run(main(args.output, args.schema))
     except Exception as e:
         print(f"error: {e}")
         sys.exit(1)
@@ -26,7 +26,7 @@ class PrimaryKey(_CompactDataClass):
     "Identifies a set of columns in a table as part of the primary key."
 
     name: str
-    column: Union[str, List[str]]
+    column: List[str]
 
 
 @dataclass(frozen=True, repr=False)
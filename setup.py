@@ -26,4 +26,5 @@ setup(
     packages=find_packages(exclude=("tests",)),
     include_package_data=True,
     install_requires=["asyncpg"],
+    extras_require={"uvloop": ["uvloop>=0.18"]},
 )
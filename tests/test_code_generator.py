@@ -1,15 +1,80 @@
+import asyncio
 import unittest
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import List, Optional
+from unittest.mock import patch
 
-from pylinsql.async_database import connection
+from pylinsql import code_generator
+from pylinsql.async_database import (
+    ConnectionParameters,
+    DatabaseClient,
+    DatabasePool,
+    connection,
+    pool,
+)
 from pylinsql.code_generator import (
+    ColumnSchema,
+    TableSchema,
+    _CatalogSchemaBuilder,
+    _ReferenceConstraint,
+    _UniqueConstraint,
     catalog_to_dataclasses,
+    clear_catalog_cache,
     dataclasses_to_code,
     get_catalog_schema,
 )
+from pylinsql.schema import ForeignKey, PrimaryKey, Reference
 
 from tests.database_test_case import DatabaseTestCase
 
 
+class _FakeClient(DatabaseClient):
+    "A database client that records queries instead of sending them to a database server."
+
+    started: List[str]
+    finished: List[str]
+    failing: Optional[str]
+
+    def __init__(
+        self,
+        params: Optional[ConnectionParameters] = None,
+        failing: Optional[str] = None,
+    ):
+        super().__init__(None, params)
+        self.started = []
+        self.finished = []
+        self.failing = failing
+
+    async def _fetch(self, query: str) -> list:
+        self.started.append(query)
+        if query == self.failing:
+            raise RuntimeError("query failed")
+        await asyncio.sleep(0.01)
+        self.finished.append(query)
+        return []
+
+    async def typed_fetch_column(self, typ, query: str, *args, column: int = 0):
+        return await self._fetch(query)
+
+    async def raw_fetch(self, query: str, *args, timeout=None, record_class=None):
+        return await self._fetch(query)
+
+
+class _FakePool(DatabasePool):
+    "A connection pool whose connections all share the same fake database client."
+
+    client: _FakeClient
+
+    def __init__(self, client: _FakeClient):
+        super().__init__(None, client.params)
+        self.client = client
+
+    @asynccontextmanager
+    async def connection(self):
+        yield self.client
+
+
 class TestCodeGenerator(DatabaseTestCase):
     def assertEmpty(self, obj):
         self.assertFalse(obj)
@@ -31,6 +96,154 @@ class TestCodeGenerator(DatabaseTestCase):
         with open("test_example.py", "w") as f:
             f.write(code)
 
+    async def test_generator_pool(self):
+        async with pool(self.params) as conn_pool:
+            catalog = await get_catalog_schema(conn_pool, "public")
+        async with connection(self.params) as conn:
+            self.assertEqual(catalog, await get_catalog_schema(conn, "public"))
+
+    async def test_cached_catalog(self):
+        async with connection(self.params) as conn:
+            catalog = await get_catalog_schema(conn, "public", cache_ttl=60)
+            self.assertNotEmpty(catalog.tables)
+            self.assertIs(
+                await get_catalog_schema(conn, "public", cache_ttl=60), catalog
+            )
+            self.assertIsNot(
+                await get_catalog_schema(conn, "public", cache_ttl=0), catalog
+            )
+
+            catalog = await get_catalog_schema(conn, "public", cache_ttl=60)
+            clear_catalog_cache()
+            self.assertIsNot(
+                await get_catalog_schema(conn, "public", cache_ttl=60), catalog
+            )
+
+
+class TestCatalogSchemaBuilder(unittest.TestCase):
+    def _table_schema(self) -> TableSchema:
+        return TableSchema(
+            name="Person",
+            description=None,
+            columns={
+                "id": ColumnSchema("id", int, None, None),
+                "address_id": ColumnSchema("address_id", int, None, None),
+            },
+        )
+
+    def _reference(self, name: str, primary_key_schema: str = "public"):
+        return _ReferenceConstraint(
+            foreign_key_name=name,
+            foreign_key_schema="public",
+            foreign_key_table="Person",
+            foreign_key_column="address_id",
+            primary_key_schema=primary_key_schema,
+            primary_key_table="Address",
+            primary_key_column="id",
+        )
+
+    def test_foreign_key(self):
+        table = self._table_schema()
+        _CatalogSchemaBuilder._bind_foreign_keys(table, [self._reference("fk")])
+        self.assertEqual(
+            table.columns["address_id"].references,
+            ForeignKey("fk", Reference("Address", "id")),
+        )
+        self.assertIsNone(table.columns["id"].references)
+
+    def test_duplicate_foreign_key(self):
+        table = self._table_schema()
+        with self.assertRaisesRegex(
+            RuntimeError, "^column address_id already has a foreign key constraint$"
+        ):
+            _CatalogSchemaBuilder._bind_foreign_keys(
+                table, [self._reference("fk1"), self._reference("fk2")]
+            )
+
+    def test_foreign_key_schema_mismatch(self):
+        table = self._table_schema()
+        with self.assertRaisesRegex(
+            RuntimeError,
+            "^foreign key table schema public and primary key table schema other are not the same$",
+        ):
+            _CatalogSchemaBuilder._bind_foreign_keys(
+                table, [self._reference("fk", primary_key_schema="other")]
+            )
+
+    def test_primary_key(self):
+        table = self._table_schema()
+        _CatalogSchemaBuilder._bind_primary_key(
+            table, [_UniqueConstraint("Person_pkey", "public", "Person", "id")]
+        )
+        self.assertEqual(table.primary_key, PrimaryKey("Person_pkey", ["id"]))
+
+        _CatalogSchemaBuilder._bind_primary_key(table, [])
+        self.assertIsNone(table.primary_key)
+
+
+class TestCatalogSchemaQueries(unittest.IsolatedAsyncioTestCase):
+    async def assertNoQueriesAfterFailure(self, client: _FakeClient, conn) -> None:
+        with self.assertRaisesRegex(RuntimeError, "^query failed$"):
+            await get_catalog_schema(conn, "public")
+
+        started = list(client.started)
+        finished = list(client.finished)
+        await asyncio.sleep(0.05)
+        self.assertEqual(client.started, started)
+        self.assertEqual(client.finished, finished)
+
+    async def test_connection_failure(self):
+        client = _FakeClient(failing=code_generator._COLS_SQL)
+        await self.assertNoQueriesAfterFailure(client, client)
+        self.assertEqual(
+            client.started, [code_generator._TABLES_SQL, code_generator._COLS_SQL]
+        )
+
+    async def test_pool_failure(self):
+        client = _FakeClient(failing=code_generator._COLS_SQL)
+        await self.assertNoQueriesAfterFailure(client, _FakePool(client))
+        self.assertEqual(client.finished, [])
+
+
+class TestCatalogCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        clear_catalog_cache()
+
+    def tearDown(self):
+        clear_catalog_cache()
+
+    def cached_databases(self) -> set:
+        return {params.database for params, _ in code_generator._catalog_cache}
+
+    async def test_expiry(self):
+        now = 0.0
+        clock = SimpleNamespace(monotonic=lambda: now)
+        long_lived = _FakeClient(ConnectionParameters(database="long"))
+        short_lived = _FakeClient(ConnectionParameters(database="short"))
+
+        with patch.object(code_generator, "time", clock):
+            catalog = await get_catalog_schema(long_lived, "public", cache_ttl=100)
+            await get_catalog_schema(short_lived, "public", cache_ttl=1)
+            self.assertEqual(self.cached_databases(), {"long", "short"})
+
+            # a short time-to-live refetches its own entry but keeps entries stored with a longer time-to-live
+            now = 5.0
+            queries = len(short_lived.started)
+            await get_catalog_schema(short_lived, "public", cache_ttl=0)
+            self.assertGreater(len(short_lived.started), queries)
+            self.assertEqual(self.cached_databases(), {"long", "short"})
+
+            queries = len(long_lived.started)
+            self.assertIs(
+                await get_catalog_schema(long_lived, "public", cache_ttl=100), catalog
+            )
+            self.assertEqual(len(long_lived.started), queries)
+
+            # entries are discarded once they outlive the time-to-live they were stored with
+            now = 200.0
+            await get_catalog_schema(short_lived, "public", cache_ttl=1)
+            self.assertEqual(self.cached_databases(), {"short"})
+
 
 if __name__ == "__main__":
     unittest.main()